@@ -8,37 +8,207 @@
 
 # ------------------ Import Libraries ------------------ #
 # Import the required libraries
+import asyncio
 import logging
 import pickle
-from typing import List
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from operator import attrgetter
+from typing import Annotated, List, Union
 
-import pandas as pd
-from fastapi import FastAPI, HTTPException
-from pydantic import ValidationError
+import numpy as np
+from fastapi import Body, FastAPI, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import Discriminator, Field, Tag
 
 # ------------------ Import Custom Modules ------------- #
-# Import the PredictRequest class
-from src.config import PredictRequest
+# Import the request models and the ordered field names
+from src.config import (
+    BINARY_MEDIA_TYPE,
+    PREDICT_FIELDS,
+    PredictColumnsRequest,
+    PredictRequest,
+    binary_response_dtype,
+    prefers_binary,
+)
 
 # ------------------ Logging --------------------------- #
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Get module logger (handlers and levels are configured by the server)
 logger = logging.getLogger(__name__)
 
 
 # ------------------ Load Model ------------------------ #
-# Load model from mounted volume
+# Define model path on the mounted volume
+MODEL_PATH = "/app/model/model.pkl"
+
+# Load scikit-learn model from mounted volume
 try:
-    with open("/app/model/model.pkl", "rb") as f:
+    with open(MODEL_PATH, "rb") as f:
         model = pickle.load(f)
 except Exception as e:
     logger.error("Error loading model: %s", e)
     raise
 
 
+# ------------------ Model Input ----------------------- #
+# Order features as seen by the model during training (the model must be
+# fitted on named columns, otherwise the input order cannot be checked)
+if not hasattr(model, "feature_names_in_"):
+    logger.error("Model has no feature_names_in_, cannot order input columns")
+    raise RuntimeError("Model was not fitted with feature names")
+_FEATURES = tuple(model.feature_names_in_)
+if not set(_FEATURES) <= set(PREDICT_FIELDS):
+    logger.error("Model features missing from request schema: %s", _FEATURES)
+    raise RuntimeError("Model features do not match the request schema")
+
+# Precompute one attribute getter per feature
+_FEATURE_GETTERS = tuple(attrgetter(name) for name in _FEATURES)
+_N_FEATURES = len(_FEATURES)
+
+# Record layout of binary responses (label and class probabilities per entry)
+_N_CLASSES = len(model.classes_)
+_BINARY_DTYPE = binary_response_dtype(_N_CLASSES)
+
+# Model is fed a plain array, silence sklearn's feature-name mismatch warning
+warnings.filterwarnings(
+    "ignore", message="X does not have valid feature names", category=UserWarning
+)
+
+
+# Function to build the model input array from a validated request body
+def build_input_array(request):
+    """Build a row-major (N, 16) float32 array, one feature column at a time."""
+    # Columnar bodies already hold one list per feature
+    if isinstance(request, PredictColumnsRequest):
+        n_rows = len(_FEATURE_GETTERS[0](request))
+        input_data = np.empty((n_rows, _N_FEATURES), dtype=np.float32)
+        for j, getter in enumerate(_FEATURE_GETTERS):
+            input_data[:, j] = getter(request)
+        return input_data
+
+    n_rows = len(request)
+    input_data = np.empty((n_rows, _N_FEATURES), dtype=np.float32)
+    for j, getter in enumerate(_FEATURE_GETTERS):
+        input_data[:, j] = np.fromiter(
+            map(getter, request), dtype=np.float32, count=n_rows
+        )
+    return input_data
+
+
+# Function to run inference on the model input array
+def run_inference(input_data):
+    """Return class predictions and probabilities from the model."""
+    # Traverse the forest once, derive labels as sklearn's predict() does
+    probability = model.predict_proba(input_data)
+    prediction = model.classes_.take(probability.argmax(axis=1))
+    return prediction, probability
+
+
+# ------------------ Micro-Batching -------------------- #
+# Define batching limits (max rows per model call, max wait to fill a batch)
+MAX_BATCH_SIZE = 1024
+BATCH_TIMEOUT = 0.003  # seconds
+
+
+# Function to coalesce concurrent requests into one model call per batch
+async def batch_worker(queue, executor):
+    """
+    Run inference for queued requests in batches.
+
+    Waits for a first request, then collects further requests for up to
+    BATCH_TIMEOUT seconds or until MAX_BATCH_SIZE rows are queued. The stacked
+    input is scored once on the inference thread and the results are split back
+    to the waiting requests. If a batch fails, its requests are re-scored one by
+    one, so the error only reaches the requests that caused it.
+
+    Args:
+        queue: asyncio.Queue of (input_data, future) tuples
+        executor: Single-thread executor that runs the model
+    """
+    loop = asyncio.get_running_loop()
+    pending = None
+
+    # Preallocate one input buffer, reused for every stacked batch (row-major
+    # like single requests, so the model sees one layout; a leading slice stays
+    # contiguous and batches are scored one at a time)
+    buffer = np.empty((MAX_BATCH_SIZE, _N_FEATURES), dtype=np.float32)
+
+    while True:
+        # Wait for the first request of the next batch
+        batch = [pending or await queue.get()]
+        n_rows = len(batch[0][0])
+        pending = None
+
+        # Collect further requests until the batch is full or the window closes
+        deadline = loop.time() + BATCH_TIMEOUT
+        while n_rows < MAX_BATCH_SIZE:
+            try:
+                item = await asyncio.wait_for(queue.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if n_rows + len(item[0]) > MAX_BATCH_SIZE:
+                pending = item
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+
+        try:
+            # Stack the batch into the preallocated buffer (a single request,
+            # possibly larger than MAX_BATCH_SIZE, is scored from its own array)
+            if len(batch) == 1:
+                input_data = batch[0][0]
+            else:
+                input_data = buffer[:n_rows]
+                np.concatenate([rows for rows, _ in batch], out=input_data)
+
+            # Make prediction on the inference thread
+            prediction, probability = await loop.run_in_executor(
+                executor, run_inference, input_data
+            )
+        except Exception as e:
+            # Re-score the requests one by one, so only the failing ones error
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                continue
+            for rows, future in batch:
+                try:
+                    result = await loop.run_in_executor(executor, run_inference, rows)
+                except Exception as item_error:
+                    if not future.done():
+                        future.set_exception(item_error)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            continue
+
+        # Split results back to the requests in queue order
+        start = 0
+        for rows, future in batch:
+            end = start + len(rows)
+            if not future.done():
+                future.set_result((prediction[start:end], probability[start:end]))
+            start = end
+
+
+# Function to manage the batch worker over the app lifetime
+@asynccontextmanager
+async def lifespan(app):
+    # Run inference on one dedicated thread, apart from the event loop and the
+    # threadpool serving sync endpoints (batches are scored one at a time anyway)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+    app.state.batch_queue = asyncio.Queue()
+    worker = asyncio.create_task(batch_worker(app.state.batch_queue, executor))
+    yield
+    worker.cancel()
+    executor.shutdown(wait=False)
+
+
 # ------------------ FastAPI App ----------------------- #
-# Initialize FastAPI app
-app = FastAPI()
+# Initialize FastAPI app (serialize responses with orjson)
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 @app.get("/")
@@ -46,33 +216,68 @@ def home():
     return {"message": "ML Model API is running"}
 
 
-@app.post("/predict/")
-def predict(request: List[PredictRequest]):
-    try:
-        # Validate the JSON structure using Pydantic
-        validated_data = [PredictRequest(**entry.dict()) for entry in request]
+# Function to route a request body to its model (JSON object -> columnar)
+def body_format(body):
+    """Return the union tag of a request body: "columnar" or "rows"."""
+    return "columnar" if isinstance(body, (dict, PredictColumnsRequest)) else "rows"
+
+
+# Define accepted request bodies (list of entries or columnar lists), each body
+# is validated against one branch only, so errors name that branch alone
+PredictBody = Annotated[
+    Union[
+        Annotated[List[PredictRequest], Field(min_length=1), Tag("rows")],
+        Annotated[PredictColumnsRequest, Tag("columnar")],
+    ],
+    Discriminator(body_format),
+]
 
-        # Convert validated_data to DataFrame
-        input_data = pd.DataFrame([entry.model_dump() for entry in validated_data])
 
-        # Make prediction
-        prediction = model.predict(input_data)
-        probability = model.predict_proba(input_data)
+@app.post("/predict/", response_model=None, response_class=ORJSONResponse)
+async def predict(
+    request: Annotated[PredictBody, Body()],
+    accept: Annotated[Union[str, None], Header()] = None,
+):
+    # Request entries are already validated by FastAPI (422 on invalid input)
+    # Convert request to the model input array (in the threadpool, off the loop)
+    input_data = await run_in_threadpool(build_input_array, request)
+
+    # Reject values that overflow float32 before they can fail a shared batch
+    if not np.isfinite(input_data).all():
+        raise HTTPException(
+            status_code=422, detail="Input values must be finite float32 numbers"
+        )
+
+    try:
+        # Queue the request for batched prediction and wait for its results
+        future = asyncio.get_running_loop().create_future()
+        await app.state.batch_queue.put((input_data, future))
+        prediction, probability = await future
 
-        # Round probability to 3 decimal places
-        probability = probability.round(3)
+        # Return labels and raw float32 probabilities as binary records when the
+        # client prefers them over JSON (unrounded, the client rounds after decoding)
+        if prefers_binary(accept):
+            records = np.empty(len(prediction), dtype=_BINARY_DTYPE)
+            records["prediction"] = prediction
+            records["probability"] = probability
+            return Response(
+                records.tobytes(),
+                media_type=BINARY_MEDIA_TYPE,
+                headers={"X-Num-Classes": str(_N_CLASSES)},
+            )
 
-        # Logging
-        # logger.info("Model expects columns: %s", model.feature_names_in_)
-        # logger.info("Streamlit input columns: %s", input_data.columns.tolist())
-        # logger.info("Input data: %s", input_data)
-        # logger.info("Prediction: %s", prediction)
+        # Round probability to 3 decimal places (in place, this request's rows)
+        np.round(probability, 3, out=probability)
 
-        return {"prediction": prediction.tolist(), "probability": probability.tolist()}
+        # Logging (guarded, array reprs are only built when debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Input columns: %s", _FEATURES)
+            logger.debug("Input data: %s", input_data)
+            logger.debug("Prediction: %s", prediction)
 
-    except ValidationError as ve:
-        logger.error("Validation error: %s", ve)
-        raise HTTPException(status_code=400, detail=str(ve)) from ve
+        # Return the response directly to bypass FastAPI's jsonable_encoder
+        # (ORJSONResponse serializes numpy arrays natively from their buffers)
+        return ORJSONResponse({"prediction": prediction, "probability": probability})
 
     except Exception as e:
         logger.error("Error during prediction: %s", e)
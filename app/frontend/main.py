@@ -8,31 +8,31 @@
 
 # ------------------ Import Libraries ------------------ #
 # Import the required libraries
-import json
 import os
 
-import pandas as pd
+import numpy as np
+import orjson
 import streamlit as st
 
 # ------------------ Import Custom Modules ------------- #
-# Import class, style configuration and utility functions
-from src.config import PredictRequest
+# Import style configuration and utility functions
 from src.style import (
     STYLE_CONFIG,
     display_back_to_top,
+    display_data_preview,
     display_divider,
     display_export_buttons,
     display_footer,
     display_github_links,
-    init_github_links_style,
     init_page_style,
 )
 from src.template import sample_json
 from src.utils import (
     combine_data,
+    count_predictions,
     export_data,
+    load_validate_json,
     make_prediction_request,
-    process_validate_input_data,
 )
 
 # ------------------ FastAPI Endpoint ------------------ #
@@ -40,6 +40,59 @@ from src.utils import (
 FASTAPI_URL = os.getenv("FASTAPI_URL", "http://backend:8000/predict/")
 
 
+# ------------------ Static Content -------------------- #
+# Render the expected JSON format (first sample entry) once at import
+SAMPLE_JSON_CODE = orjson.dumps(sample_json[0], option=orjson.OPT_INDENT_2).decode()
+
+
+# ------------------ Feature Encoding ------------------ #
+# Map manual input options to their encoded model features
+OCCUPATION_FEATURES = {
+    "Professional": {
+        "current_occupation_student": False,
+        "current_occupation_unemployed": False,
+    },
+    "Unemployed": {
+        "current_occupation_student": False,
+        "current_occupation_unemployed": True,
+    },
+    "Student": {
+        "current_occupation_student": True,
+        "current_occupation_unemployed": False,
+    },
+}
+FIRST_INTERACTION_FEATURES = {
+    "Website": {"first_interaction_website": True},
+    "Mobile App": {"first_interaction_website": False},
+}
+PROFILE_COMPLETED_FEATURES = {
+    "Low (0-50%)": {"profile_completed_low": True, "profile_completed_medium": False},
+    "Medium (50-75%)": {
+        "profile_completed_low": False,
+        "profile_completed_medium": True,
+    },
+    "High (75-100%)": {
+        "profile_completed_low": False,
+        "profile_completed_medium": False,
+    },
+}
+LAST_ACTIVITY_FEATURES = {
+    "Email": {"last_activity_phone": False, "last_activity_website": False},
+    "Phone": {"last_activity_phone": True, "last_activity_website": False},
+    "Website": {"last_activity_phone": False, "last_activity_website": True},
+}
+REFERRAL_FEATURES = {
+    "Yes": {"referral_yes": True},
+    "No": {"referral_yes": False},
+}
+MEDIA_FEATURES = {
+    "Print Media Type 1": "print_media_type1_yes",
+    "Print Media Type 2": "print_media_type2_yes",
+    "Digital Media Ads": "digital_media_yes",
+    "Educational Channels": "educational_channels_yes",
+}
+
+
 # ------------------ Page Configuration ---------------- #
 # Extract style configuration
 convert_color = STYLE_CONFIG["CONVERT_COLOR"]
@@ -48,7 +101,6 @@ line_color = STYLE_CONFIG["LINE_COLOR"]
 
 # Initialize page styling
 init_page_style()
-init_github_links_style()
 
 
 # ------------------ Header Section -------------------- #
@@ -119,13 +171,14 @@ input_method = st.radio(
 if input_method == "Upload JSON":
     # Display a preview of the expected JSON format
     with st.expander("Preview expected JSON format"):
-        st.code(json.dumps(sample_json[0], indent=4), language="json")
+        st.code(SAMPLE_JSON_CODE, language="json")
 
 # Horizontal line
 display_divider()
 
-# Ensure data_to_send is initialized
+# Ensure data_to_send and predict are initialized
 data_to_send = None
+predict = False
 
 if input_method == "Upload JSON":
 
@@ -133,156 +186,139 @@ if input_method == "Upload JSON":
     uploaded_file = st.file_uploader("Choose a JSON file", type="json")
 
     if uploaded_file is not None:
-        try:
-            # Read and parse the JSON file
-            data = json.load(uploaded_file)
-
-            # Prepare and validate the input data
-            data_to_send, error = process_validate_input_data(data)
-
-            if error:
-                st.error(error)
-            else:
-                st.success("JSON data loaded successfully!")
+        # Parse and validate the JSON file (cached on the file content)
+        data_to_send, error = load_validate_json(uploaded_file.getvalue())
 
-                # Display the data for API request
-                with st.expander("Preview data to be sent to API"):
-                    st.write(data_to_send)
+        if error:
+            st.error(error)
+        else:
+            st.success("JSON data loaded successfully!")
 
-        except json.JSONDecodeError:
-            st.error("Invalid JSON file. Please upload a valid JSON file.")
+            # Display the data for API request
+            with st.expander("Preview data to be sent to API"):
+                display_data_preview(data_to_send)
 
 elif input_method == "Use Sample Data":
 
-    # Use sample JSON data directly
-    data = sample_json
+    # Use the sample data as is (trusted constant, sent without processing)
+    data_to_send = sample_json
+    st.success("Sample data loaded successfully!")
 
-    # Prepare and validate the input data
-    data_to_send, error = process_validate_input_data(data)
+    # Display the data for API request
+    with st.expander("Preview data to be sent to API"):
+        display_data_preview(data_to_send)
 
-    if error:
-        st.error(error)
-    else:
-        st.success("Sample data loaded successfully!")
+elif input_method == "Manual Input":
 
-        # Display the data for API request
-        with st.expander("Preview data to be sent to API"):
-            st.write(data_to_send)
+    # Collect inputs in a form (widget changes only rerun the app on submit)
+    with st.form("lead_form"):
+        # --- Numerical Inputs --- #
+        age = st.number_input(
+            "Age",
+            min_value=0,
+            max_value=100,
+            value=50,
+            step=1,
+            help="Enter the age of the lead (0-100 years).",
+        )
+        website_visits = st.number_input(
+            "Number of Website Visits",
+            min_value=0,
+            value=5,
+            step=1,
+            help="Enter the total number of visits to the website.",
+        )
+        time_spent_on_website = st.number_input(
+            "Total Time Spent on Website (seconds)",
+            min_value=0,
+            value=180,
+            step=1,
+            help="Enter the total time spent on the website in seconds.",
+        )
+        page_views_per_visit = st.number_input(
+            "Page Views per Visit",
+            min_value=0.0,
+            value=2.5,
+            step=0.1,
+            help="Enter the average number of pages viewed per visit.",
+        )
 
-elif input_method == "Manual Input":
+        # --- Categorical Inputs (Dropdowns) --- #
+        current_occupation = st.selectbox(
+            "Current Occupation",
+            list(OCCUPATION_FEATURES),
+            index=0,
+            help="Select the current occupation of the lead.",
+        )
+        first_interaction = st.selectbox(
+            "First Interaction Channel",
+            list(FIRST_INTERACTION_FEATURES),
+            index=0,
+            help="Select the first interaction channel with the lead.",
+        )
+        profile_completed = st.selectbox(
+            "Profile Completion Level",
+            list(PROFILE_COMPLETED_FEATURES),
+            index=0,
+            help="Select the level of profile completion for the lead.",
+        )
+        last_activity = st.selectbox(
+            "Most Recent Interaction",
+            list(LAST_ACTIVITY_FEATURES),
+            index=0,
+            help="Select the most recent interaction with the lead.",
+        )
+        referral_yes = st.selectbox(
+            "Referred by Others",
+            list(REFERRAL_FEATURES),
+            index=0,
+            help="Select if the lead was referred by others.",
+        )
 
-    # --- Numerical Inputs --- #
-    age = st.number_input(
-        "Age",
-        min_value=0,
-        max_value=100,
-        value=50,
-        step=1,
-        help="Enter the age of the lead (0-100 years).",
-    )
-    website_visits = st.number_input(
-        "Number of Website Visits",
-        min_value=0,
-        value=5,
-        step=1,
-        help="Enter the total number of visits to the website.",
-    )
-    time_spent_on_website = st.number_input(
-        "Total Time Spent on Website (seconds)",
-        min_value=0,
-        value=180,
-        step=1,
-        help="Enter the total time spent on the website in seconds.",
-    )
-    page_views_per_visit = st.number_input(
-        "Page Views per Visit",
-        min_value=0.0,
-        value=2.5,
-        step=0.1,
-        help="Enter the average number of pages viewed per visit.",
-    )
-
-    # --- Categorical Inputs (Dropdowns) --- #
-    current_occupation = st.selectbox(
-        "Current Occupation",
-        ["Professional", "Unemployed", "Student"],
-        index=0,
-        help="Select the current occupation of the lead.",
-    )
-    first_interaction = st.selectbox(
-        "First Interaction Channel",
-        ["Website", "Mobile App"],
-        index=0,
-        help="Select the first interaction channel with the lead.",
-    )
-    profile_completed = st.selectbox(
-        "Profile Completion Level",
-        ["Low (0-50%)", "Medium (50-75%)", "High (75-100%)"],
-        index=0,
-        help="Select the level of profile completion for the lead.",
-    )
-    last_activity = st.selectbox(
-        "Most Recent Interaction",
-        ["Email", "Phone", "Website"],
-        index=0,
-        help="Select the most recent interaction with the lead.",
-    )
-    referral_yes = st.selectbox(
-        "Referred by Others",
-        ["Yes", "No"],
-        index=0,
-        help="Select if the lead was referred by others.",
-    )
-
-    # --- Multi-select Input --- #
-    media_types = st.multiselect(
-        "Seen via Media or Education Channels",
-        [
-            "Print Media Type 1",
-            "Print Media Type 2",
-            "Digital Media Ads",
-            "Educational Channels",
-        ],
-        default=["Digital Media Ads"],
-        help="Select the media or education channels through which the lead was acquired.",
-    )
-
-    # Prepare data for API request
-    data = [
-        {
-            "age": age,
-            "website_visits": website_visits,
-            "time_spent_on_website": time_spent_on_website,
-            "page_views_per_visit": page_views_per_visit,
-            "current_occupation_student": current_occupation == "Student",
-            "current_occupation_unemployed": current_occupation == "Unemployed",
-            "first_interaction_website": first_interaction == "Website",
-            "profile_completed_low": profile_completed == "Low (0-50%)",
-            "profile_completed_medium": profile_completed == "Medium (50-75%)",
-            "last_activity_phone": last_activity == "Phone",
-            "last_activity_website": last_activity == "Website",
-            "print_media_type1_yes": "Print Media Type 1" in media_types,
-            "print_media_type2_yes": "Print Media Type 2" in media_types,
-            "digital_media_yes": "Digital Media Ads" in media_types,
-            "educational_channels_yes": "Educational Channels" in media_types,
-            "referral_yes": referral_yes == "Yes",
-        }
-    ]
+        # --- Multi-select Input --- #
+        media_types = st.multiselect(
+            "Seen via Media or Education Channels",
+            list(MEDIA_FEATURES),
+            default=["Digital Media Ads"],
+            help="Select the media or education channels through which the lead was acquired.",
+        )
 
-    # Prepare and validate the input data
-    data_to_send, error = process_validate_input_data(data)
+        # Submit button
+        predict = st.form_submit_button("Predict")
+
+    if predict:
+        # Prepare data for API request (encoded via lookup tables)
+        selected_media = frozenset(media_types)
+        data = [
+            {
+                "age": age,
+                "website_visits": website_visits,
+                "time_spent_on_website": time_spent_on_website,
+                "page_views_per_visit": page_views_per_visit,
+                **OCCUPATION_FEATURES[current_occupation],
+                **FIRST_INTERACTION_FEATURES[first_interaction],
+                **PROFILE_COMPLETED_FEATURES[profile_completed],
+                **LAST_ACTIVITY_FEATURES[last_activity],
+                **{
+                    feature: label in selected_media
+                    for label, feature in MEDIA_FEATURES.items()
+                },
+                **REFERRAL_FEATURES[referral_yes],
+            }
+        ]
+
+        # Use the input data as is (constrained by the widgets, sent without processing)
+        data_to_send = data
 
-    if error:
-        st.error(error)
-    else:
         # Display the data for API request
         with st.expander("Preview data to be sent to API"):
-            st.write(data_to_send)
+            display_data_preview(data_to_send)
 
 
 # ------------------ Prediction Section ----------------- #
-# Prediction Button
-predict = st.button("Predict")
+# Prediction Button (manual input is submitted with its form)
+if input_method != "Manual Input":
+    predict = st.button("Predict")
 
 if predict:
     if data_to_send is None:
@@ -305,6 +341,8 @@ if predict:
             st.error(error)
         elif prediction is None or probability is None:
             st.error("API response missing required data.")
+        elif not np.isin(prediction, (0, 1)).all():
+            st.error("API response contains unexpected prediction labels.")
         else:
             st.success("Prediction successful!")
 
@@ -330,20 +368,15 @@ if predict:
 
             else:
                 # Display distribution of predictions
-                prediction_series = pd.Series(prediction)
-                value_counts = prediction_series.value_counts().to_dict()
-
                 # Total number of predictions
                 total_count = len(prediction)
 
-                # Get counts for each class (0 and 1)
-                count_0 = value_counts.get(0, 0)  # Default value is 0
-                count_1 = value_counts.get(1, 0)  # Default value is 0
-                total = count_0 + count_1
+                # Get counts for each class (0 and 1) in a single pass
+                count_0, count_1 = count_predictions(prediction)
 
                 # Calculate percentages (handle division by zero)
-                percentage_0 = (count_0 / total * 100) if total > 0 else 0
-                percentage_1 = (count_1 / total * 100) if total > 0 else 0
+                percentage_0 = count_0 * 100 / max(total_count, 1)
+                percentage_1 = count_1 * 100 / max(total_count, 1)
 
                 st.markdown(
                     f"""
@@ -379,14 +412,16 @@ if predict:
                 )
 
             # Create a DataFrame with input data, predictions and probabilities
-            results_df, error = combine_data(data_to_send, prediction, probability)
+            results_df, summary_df, error = combine_data(
+                data_to_send, prediction, probability
+            )
 
             if error:
                 st.error(error)
             else:
                 # Only proceed if data was combined successfully
                 with st.expander("See prediction output and associated probability"):
-                    st.write(results_df.loc[:, ["prediction", "probability"]])
+                    st.write(summary_df)
 
                 # Export data to CSV or JSON
                 csv_data, json_data, error = export_data(results_df)
@@ -1,6 +1,7 @@
 # -------------------------------------------------------------------------- #
 # Title: Pydantic Model for Request Body
-# Description: Definition of Pydantic model for request body
+# Description: Definition of Pydantic model for request body and shared
+#              response format helpers
 # Author: Thomas Moesl
 # Date: March 2025
 # -------------------------------------------------------------------------- #
@@ -8,7 +9,17 @@
 
 # ------------------ Import Libraries ------------------ #
 # Import the required libraries
-from pydantic import BaseModel, Field
+from typing import Annotated, Literal
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    create_model,
+    model_validator,
+)
 
 
 # ------------------ Pydantic Model --------------------- #
@@ -31,6 +42,9 @@ class PredictRequest(BaseModel):
         BaseModel: Base class for Pydantic models
     """
 
+    # Reject unknown fields and make validated entries immutable
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     # Define fields with validation rules
     age: int = Field(ge=0, le=100)
     website_visits: int = Field(ge=0)
@@ -50,5 +64,138 @@ class PredictRequest(BaseModel):
     referral_yes: bool
 
 
+# ------------------ Schema Constants ------------------ #
+# Ordered request field names (model feature order), computed once at import
+PREDICT_FIELDS = tuple(PredictRequest.model_fields)
+
+# List validator for request batches, built once and shared by all callers
+PREDICT_LIST_ADAPTER = TypeAdapter(list[PredictRequest])
+
+
+# ------------------ Columnar Request Model ------------ #
+# Define base model for columnar request bodies
+class ColumnarRequestBase(BaseModel):
+    """
+    Base model for columnar request bodies.
+
+    Carries the format marker and checks that all feature columns hold the
+    same, non-zero number of entries.
+
+    Args:
+        BaseModel: Base class for Pydantic models
+    """
+
+    # Reject unknown fields and make validated bodies immutable
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    format: Literal["columnar"]
+
+    @model_validator(mode="after")
+    def check_column_lengths(self):
+        lengths = {len(getattr(self, name)) for name in PREDICT_FIELDS}
+        if len(lengths) != 1 or 0 in lengths:
+            raise ValueError("Columns must be non-empty and of equal length")
+        return self
+
+
+# Define columnar request body, one list per PredictRequest field (field names
+# are sent once per batch; each entry keeps the field's validation rules)
+PredictColumnsRequest = create_model(
+    "PredictColumnsRequest",
+    __base__=ColumnarRequestBase,
+    **{
+        name: (list[Annotated[field.annotation, field]], ...)
+        for name, field in PredictRequest.model_fields.items()
+    },
+)
+
+
+# ------------------ Binary Response Format ------------ #
+# Media type of binary prediction responses (negotiated via Accept)
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+
+# Function to define the record layout of binary prediction responses
+def binary_response_dtype(n_classes):
+    """
+    Return the little-endian record layout of binary prediction responses.
+
+    Each record holds one entry's predicted label and its float32 class
+    probabilities; the number of classes is sent in the X-Num-Classes header.
+
+    Args:
+        n_classes: Number of model classes (probability columns)
+
+    Returns:
+        np.dtype: Structured record dtype
+    """
+    return np.dtype([("prediction", "<i8"), ("probability", "<f4", (n_classes,))])
+
+
+# ------------------ Media Type Negotiation ------------ #
+# Header helpers shared by the API and the frontend client (kept in this module
+# because it is the only shared file mounted into the backend container)
+
+
+# Function to parse the media types listed in an Accept or Content-Type header
+def parse_media_types(header):
+    """
+    Parse a media type header into its media types and quality values.
+
+    Parameters other than q (e.g. charset) are ignored; malformed q values
+    count as 0 (not acceptable).
+
+    Args:
+        header: Header value, e.g. "application/octet-stream, application/json"
+
+    Returns:
+        dict: Lower-cased media type mapped to its quality value
+    """
+    media_types = {}
+    for item in (header or "").split(","):
+        media_type, *params = item.split(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_types[media_type] = quality
+    return media_types
+
+
+# Function to decide whether a client prefers binary prediction responses
+def prefers_binary(accept):
+    """
+    Check whether an Accept header prefers binary responses over JSON.
+
+    Binary is chosen only if it is listed explicitly and its quality is at
+    least that of JSON (application/json or the most specific wildcard).
+
+    Args:
+        accept: Accept header value, or None
+
+    Returns:
+        bool: True if a binary response should be returned
+    """
+    media_types = parse_media_types(accept)
+    binary_quality = media_types.get(BINARY_MEDIA_TYPE, 0.0)
+    # JSON quality comes from the most specific matching range
+    json_quality = next(
+        (
+            media_types[name]
+            for name in ("application/json", "application/*", "*/*")
+            if name in media_types
+        ),
+        0.0,
+    )
+    return binary_quality > 0 and binary_quality >= json_quality
+
+
 # -------------------------------------------------------------------------- #
 # -------------------------------------------------------------------------- #
@@ -10,6 +10,7 @@
 # Import the required libraries
 import datetime
 
+import orjson
 import streamlit as st
 
 # ---------------- Style Configuration ----------------- #
@@ -30,12 +31,21 @@ border_color = STYLE_CONFIG["BORDER_COLOR"]
 line_color = STYLE_CONFIG["LINE_COLOR"]
 
 
-# ------------------ Style Functions ------------------ #
-# Function to initialize page styling
-def init_page_style():
-    """Initialize page styling and CSS variables."""
-    st.markdown(
-        f"""
+# ---------------- Static Markup ----------------------- #
+# Copyright year, resolved once at import
+_CURRENT_YEAR = datetime.datetime.now().year
+
+# Constant HTML for the themed divider and the footer (built once at import)
+_DIVIDER_HTML = "<div class='custom-divider'></div>"
+_FOOTER_HTML = f"""
+        <div style="text-align: center; font-size: small; color: gray;">
+            &copy; {_CURRENT_YEAR} Thomas Moesl. All rights reserved.
+        </div>
+        """
+
+
+# Page CSS, interpolated from the style configuration once at import
+_PAGE_CSS = f"""
         <style>
         /* Import fonts */
         @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300&display=swap');
@@ -117,16 +127,10 @@ def init_page_style():
             margin-bottom: 0.75rem; 
         }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
+        """
 
-# Function to initialize GitHub links styling
-def init_github_links_style():
-    """Initialize GitHub links styling."""
-    st.markdown(
-        f"""
+# GitHub links CSS, interpolated once at import
+_GH_CSS = f"""
         <style>
         .github-links {{
             text-align: left;
@@ -158,9 +162,17 @@ def init_github_links_style():
             height: 13px;
         }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+# All CSS combined, so styling is sent to the browser as a single element
+_STYLE_HTML = _PAGE_CSS + _GH_CSS
+
+
+# ------------------ Style Functions ------------------ #
+# Function to initialize page styling
+def init_page_style():
+    """Initialize page styling, CSS variables and GitHub links styling."""
+    st.markdown(_STYLE_HTML, unsafe_allow_html=True)
 
 
 # Function to display GitHub repository links
@@ -205,26 +217,14 @@ def display_back_to_top():
 
 # Function to display a horizontal divider
 def display_divider():
-    """Display a themed horizontal divider."""
-    st.markdown(
-        "<div class='custom-divider'></div>",
-        unsafe_allow_html=True,
-    )
+    """Display a themed horizontal divider (raw HTML, no Markdown parsing)."""
+    st.html(_DIVIDER_HTML)
 
 
 # Function to display the footer
 def display_footer():
     """Display the footer with copyright information."""
-
-    current_year = datetime.datetime.now().year
-    st.markdown(
-        f"""
-        <div style="text-align: center; font-size: small; color: gray;">
-            &copy; {current_year} Thomas Moesl. All rights reserved.
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 # Function to display download buttons for CSV and JSON exports
@@ -265,5 +265,23 @@ def display_export_buttons(csv_data, json_data):
         )
 
 
+# Function to display a short preview of the data sent to the API
+def display_data_preview(data, n_rows=5):
+    """Display the first rows of the data as JSON code with a row count.
+
+    Args:
+        data: List of dictionaries to preview
+        n_rows: Number of leading rows to show
+
+    Returns:
+        None
+    """
+    st.code(
+        orjson.dumps(data[:n_rows], option=orjson.OPT_INDENT_2).decode(),
+        language="json",
+    )
+    st.caption(f"Showing {min(n_rows, len(data))} of {len(data)} rows")
+
+
 # -------------------------------------------------------------------------- #
 # -------------------------------------------------------------------------- #
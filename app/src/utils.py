@@ -7,19 +7,131 @@
 
 # ------------------ Import Libraries ------------------ #
 # Import the required libraries
-import pandas as pd
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import orjson
 import requests
+import streamlit as st
 from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import (
+    BINARY_MEDIA_TYPE,
+    PREDICT_FIELDS,
+    PREDICT_LIST_ADAPTER,
+    binary_response_dtype,
+    parse_media_types,
+)
+
+
+# ------------------ HTTP Session ---------------------- #
+# Function to get a persistent HTTP session for the API
+@st.cache_resource
+def get_session():
+    """
+    Create a persistent HTTP session, shared across Streamlit reruns.
+
+    Keeps connections to the backend alive, so repeated prediction requests
+    reuse an open connection instead of a new TCP handshake per request.
+
+    Returns:
+        requests.Session: Shared HTTP session
+    """
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+
+    # Retry connect errors and transient gateway errors with exponential backoff
+    # (predictions are idempotent, so POST requests are safe to repeat); read
+    # timeouts are not retried, re-posting to a saturated backend only adds load
+    retries = Retry(
+        total=3,
+        read=0,
+        backoff_factor=0.25,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False,  # return the last response once retries run out
+    )
+
+    # Keep a pool of keep-alive connections per backend host, large enough for
+    # the concurrent chunk requests (MAX_WORKERS) of a batched upload
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
 
-from src.config import PredictRequest
+
+# ------------------ Request Batching ------------------ #
+# Define client-side batching limits (rows per request, concurrent requests)
+BATCH_SIZE = 256
+MAX_WORKERS = 8
 
 
 # ------------------ Utility Functions ----------------- #
+# Function to convert entries into a columnar request body
+def to_columnar(data):
+    """
+    Convert a list of entries into a columnar request body.
+
+    Field names are sent once per request instead of once per entry.
+
+    Args:
+        data: List of dictionaries containing input features
+
+    Returns:
+        dict: Format marker and one list of values per feature
+    """
+    columns = {name: [entry[name] for entry in data] for name in PREDICT_FIELDS}
+    return {"format": "columnar", **columns}
+
+
+# Function to parse a prediction response (binary records or JSON)
+def parse_prediction_response(response):
+    """
+    Parse the predictions and probabilities from an API response.
+
+    Binary responses are decoded with np.frombuffer and their probabilities
+    rounded to 3 decimal places; any other response is parsed as JSON.
+
+    Args:
+        response: Successful response of the prediction API
+
+    Returns:
+        tuple: (prediction, probability), None for missing fields
+
+    Raises:
+        KeyError, ValueError: If the response body or headers are malformed
+    """
+    content_type = next(
+        iter(parse_media_types(response.headers.get("Content-Type"))), None
+    )
+    if content_type == BINARY_MEDIA_TYPE:
+        n_classes = int(response.headers["X-Num-Classes"])
+        records = np.frombuffer(
+            response.content, dtype=binary_response_dtype(n_classes)
+        )
+        # Round in float64, so values display as in the JSON response
+        probability = np.round(records["probability"].astype(np.float64), 3)
+        return records["prediction"], probability
+
+    result = orjson.loads(response.content)
+    return result.get("prediction"), result.get("probability")
+
+
 # Function to make a prediction request to the API
 def make_prediction_request(data, api_url="http://localhost:8000/predict/"):
     """
     Make a prediction request to the API.
 
+    Payloads larger than BATCH_SIZE rows are split into chunks that are posted
+    concurrently over the shared session; results are concatenated in order.
+    Binary responses (labels and float32 probabilities) are requested, with
+    JSON responses still accepted.
+
     Args:
         data: Data to send to the API
         api_url: The URL of the prediction API endpoint
@@ -27,21 +139,52 @@ def make_prediction_request(data, api_url="http://localhost:8000/predict/"):
     Returns:
         tuple: (success, prediction, probability, error_message)
     """
-    try:
-        response = requests.post(
+    session = get_session()
+
+    # Function to post one chunk of entries to the API (in columnar format)
+    def post_batch(batch):
+        return session.post(
             api_url,
-            json=data,
-            timeout=10,
+            data=orjson.dumps(to_columnar(batch)),
+            headers={"Accept": f"{BINARY_MEDIA_TYPE}, application/json;q=0.9"},
+            timeout=(3, 30),  # (connect, read) seconds
         )
-        if response.status_code == 200:
-            prediction = response.json().get("prediction")
-            probability = response.json().get("probability")
-            return True, prediction, probability, None
+
+    try:
+        # Split the payload into chunks and post them concurrently
+        batches = [data[i : i + BATCH_SIZE] for i in range(0, len(data), BATCH_SIZE)]
+        if len(batches) <= 1:
+            responses = [post_batch(data)]
         else:
-            return False, None, None, f"Error in prediction: {response.status_code}"
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_WORKERS, len(batches))
+            ) as executor:
+                responses = list(executor.map(post_batch, batches))
+
+        # Parse the responses and concatenate the results in request order
+        predictions, probabilities = [], []
+        for response in responses:
+            if response.status_code != 200:
+                return (
+                    False,
+                    None,
+                    None,
+                    f"Error in prediction: {response.status_code}",
+                )
+            prediction, probability = parse_prediction_response(response)
+            if prediction is None or probability is None:
+                return True, None, None, None
+            predictions.append(prediction)
+            probabilities.append(probability)
+        prediction = np.concatenate(predictions)
+        probability = np.concatenate(probabilities)
+
+        return True, prediction, probability, None
 
     except requests.exceptions.RequestException as e:
         return False, None, None, f"Backend API request error: {e}"
+    except (KeyError, ValueError) as e:
+        return False, None, None, f"Invalid API response: {e}"
 
 
 # Function to process and validate input data
@@ -60,13 +203,12 @@ def process_validate_input_data(data):
         if isinstance(data, dict):
             data = [data]
 
-        # Validate the JSON structure using Pydantic
-        validated_data = [PredictRequest(**entry) for entry in data]
-
-        # Serialize the data for API request
-        processed_data = [entry.model_dump() for entry in validated_data]
+        # Validate the JSON structure using Pydantic (whole batch at once)
+        validated = PREDICT_LIST_ADAPTER.validate_python(data)
 
-        return processed_data, None
+        # Dump the validated entries, so coerced values (e.g. "42", "yes") reach
+        # the request, results and exports in canonical form
+        return PREDICT_LIST_ADAPTER.dump_python(validated), None
 
     except ValidationError as e:
         return None, f"Validation error: {e}"
@@ -74,51 +216,115 @@ def process_validate_input_data(data):
         return None, f"Error processing data: {str(e)}"
 
 
+# Function to parse and validate an uploaded JSON file (cached per file content,
+# bounded to a few recent uploads that expire after an hour)
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
+def load_validate_json(raw_bytes):
+    """
+    Parse and validate uploaded JSON data, memoized on the raw file content.
+
+    Reruns with an unchanged upload return the cached result instead of
+    parsing and validating the file again. Only the most recent uploads are
+    kept, so parsed payloads do not accumulate in server memory.
+
+    Args:
+        raw_bytes: Raw content of the uploaded JSON file
+
+    Returns:
+        tuple: (processed_data, error_message)
+    """
+    try:
+        data = orjson.loads(raw_bytes)
+    except orjson.JSONDecodeError:
+        return None, "Invalid JSON file. Please upload a valid JSON file."
+
+    return process_validate_input_data(data)
+
+
+# Function to count binary predictions per class
+def count_predictions(prediction):
+    """
+    Count binary predictions per class in a single vectorized pass.
+
+    Args:
+        prediction: List of prediction values (0 or 1)
+
+    Returns:
+        tuple: (count_0, count_1)
+
+    Raises:
+        ValueError: If a label is outside {0, 1}
+    """
+    # Count labels per class with bincount (unpacking fails on other labels)
+    count_0, count_1 = np.bincount(np.asarray(prediction, dtype=np.intp), minlength=2)
+    return int(count_0), int(count_1)
+
+
 # Function to combine input data, predictions, and probabilities into a DataFrame
 def combine_data(input_data, predictions, probabilities):
     """
     Combines input data with model predictions and their probabilities into a single DataFrame.
 
+    Also returns a narrow summary frame holding only the prediction and probability
+    columns, built directly from the result arrays for display.
+
     Args:
         input_data: List of dictionaries containing input features
         predictions: List of prediction values (0 or 1)
         probabilities: List of probability arrays
 
     Returns:
-        tuple: (dataframe, error_message)
+        tuple: (dataframe, summary_dataframe, error_message)
     """
+    # Import pandas on first use, keeping it off the app's startup path
+    import pandas as pd
+
     try:
         # Check for None inputs
         if input_data is None or predictions is None or probabilities is None:
-            return None, "Missing input data, predictions, or probabilities"
+            return None, None, "Missing input data, predictions, or probabilities"
 
         # Check if lengths match
         if len(input_data) != len(predictions) or len(input_data) != len(probabilities):
             return (
+                None,
                 None,
                 "Length mismatch between input data, predictions, and probabilities",
             )
 
         # Handle empty input case
         if len(input_data) == 0 and len(predictions) == 0 and len(probabilities) == 0:
-            return pd.DataFrame(), None  # Return empty DataFrame with no error
+            # Return empty DataFrames with no error
+            return pd.DataFrame(), pd.DataFrame(), None
+
+        # Collect input columns in model feature order (no per-row key discovery)
+        columns = {
+            name: [entry[name] for entry in input_data] for name in PREDICT_FIELDS
+        }
+
+        # Add predictions and the probability of each predicted class (vectorized)
+        predictions = np.asarray(predictions, dtype=np.intp)
+        probability = np.asarray(probabilities)[
+            np.arange(predictions.size), predictions
+        ]
+        columns["prediction"] = predictions
+        columns["probability"] = probability
 
-        # Create DataFrame from input data
-        df = pd.DataFrame(input_data)
+        # Create DataFrame from the column dict
+        df = pd.DataFrame(columns, copy=False)
 
-        # Add predictions and probabilities
-        df["prediction"] = predictions
-        df["probability"] = [
-            prob[pred] for pred, prob in zip(predictions, probabilities)
-        ]
+        # Create summary DataFrame on the same result arrays (no input columns)
+        summary_df = pd.DataFrame(
+            {"prediction": predictions, "probability": probability}, copy=False
+        )
 
-        return df, None  # Return DataFrame with no error
+        return df, summary_df, None  # Return DataFrames with no error
 
     except Exception as e:
-        return None, f"Error combining data: {e}"
+        return None, None, f"Error combining data: {e}"
 
 
-# Function to display download buttons for CSV and JSON exports
+# Function to export the results to CSV and JSON
 def export_data(data):
     """
     Exports the DataFrame to CSV and JSON formats.
@@ -127,14 +333,28 @@ def export_data(data):
         data: DataFrame to export
 
     Returns:
-        tuple: (csv_data, json_data, error_message)
+        tuple: (csv_bytes, json_bytes, error_message)
     """
     try:
         if data is None:
             return None, None, "No data provided"
 
-        export_file_csv = data.to_csv(index=False)
-        export_file_json = data.to_json(orient="records")
+        # Materialize rows once as plain tuples, shared by both writers
+        columns = list(data.columns)
+        rows = list(data.itertuples(index=False, name=None))
+
+        # Write CSV rows directly, bypassing pandas' per-column formatting
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+        export_file_csv = buffer.getvalue().encode()
+
+        # Serialize records with orjson (same layout as orient="records")
+        export_file_json = orjson.dumps(
+            [dict(zip(columns, row)) for row in rows],
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
 
         return export_file_csv, export_file_json, None
 